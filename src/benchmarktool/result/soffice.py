@@ -5,10 +5,12 @@ Created on Jan 20, 2010
 '''
 
 import zipfile
+import io
 try: from StringIO import StringIO
 except: from io import StringIO
 import math
 import sys
+import time
 from benchmarktool import tools
 from benchmarktool.tools import Sortable, cmp
 
@@ -23,7 +25,16 @@ class Spreadsheet:
 
     def printSheet(self, out):
         zipFile = zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED)
-        out = StringIO()
+        zipFile.writestr("mimetype", '''application/vnd.oasis.opendocument.spreadsheet''')
+        # stream the table rows directly into the archive so that the
+        # content does not have to be kept in memory (needs python >= 3.6)
+        if sys.version_info >= (3, 6):
+            info = zipfile.ZipInfo("content.xml", time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # the size is not known in advance, so zip64 has to be allowed up front
+            out = io.TextIOWrapper(zipFile.open(info, "w", force_zip64=True), encoding="utf-8")
+        else:
+            out = StringIO()
 
         out.write('''\
 <?xml version="1.0" encoding="UTF-8"?>\
@@ -57,8 +68,10 @@ class Spreadsheet:
         self.instSheet.printSheet(out, "Instances")
         self.classSheet.printSheet(out, "Classes")
         out.write('''</office:spreadsheet></office:body></office:document-content>''')
-        zipFile.writestr("mimetype", '''application/vnd.oasis.opendocument.spreadsheet''')
-        zipFile.writestr("content.xml", out.getvalue())
+        if sys.version_info >= (3, 6):
+            out.close()
+        else:
+            zipFile.writestr("content.xml", out.getvalue())
         zipFile.writestr("META-INF/manifest.xml", '''\
 <?xml version="1.0" encoding="UTF-8"?>\
 <manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0">\
@@ -84,7 +97,7 @@ class Spreadsheet:
 </office:document-styles>\
 ''')
 
-        settings = '''\
+        settings = ['''\
 <office:document-settings xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:config="urn:oasis:names:tc:opendocument:xmlns:config:1.0" xmlns:ooo="http://openoffice.org/2004/office" office:version="1.2">\
 <office:settings>\
 <config:config-item-set config:name="ooo:view-settings">\
@@ -92,9 +105,9 @@ class Spreadsheet:
 <config:config-item-map-entry>\
 <config:config-item config:name="ViewId" config:type="string">View1</config:config-item>\
 <config:config-item-map-named config:name="Tables">\
-'''
+''']
         for name, arange, right in [("Instances", 3, 1), ("Classes", 2, 0)]:
-            settings += '''\
+            settings.append('''\
 <config:config-item-map-entry config:name="{name}">\
 <config:config-item config:name="HorizontalSplitMode" config:type="short">2</config:config-item>\
 <config:config-item config:name="VerticalSplitMode" config:type="short">2</config:config-item>\
@@ -106,26 +119,38 @@ class Spreadsheet:
 <config:config-item config:name="PositionTop" config:type="int">0</config:config-item>\
 <config:config-item config:name="PositionBottom" config:type="int">2</config:config-item>\
 </config:config-item-map-entry>\
-'''.format(name=name, arange=arange, right=right)
-        settings += '''\
+'''.format(name=name, arange=arange, right=right))
+        settings.append('''\
 </config:config-item-map-named>\
 </config:config-item-map-entry>\
 </config:config-item-map-indexed>\
 </config:config-item-set>\
 </office:settings>\
 </office:document-settings>\
-'''
-        zipFile.writestr("settings.xml", settings)
+''')
+        zipFile.writestr("settings.xml", "".join(settings))
         zipFile.close()
 
     def addRunspec(self, runspec):
-        self.instSheet.addRunspec(runspec)
-        self.classSheet.addRunspec(runspec)
+        # the measures of all runs are extracted once and shared by both sheets
+        results = []
+        for classresult in runspec:
+            cells = []
+            for instresult in classresult:
+                for run in instresult:
+                    line = instresult.instance.line + run.number - 1
+                    for name, valueType, value in run.iter(self.instSheet.measures):
+                        if valueType != "float": valueType = "string"
+                        else: value = float(value)
+                        cells.append((line, name, valueType, value))
+            results.append((classresult.benchclass, cells))
+        self.instSheet.addRunspec(runspec, results)
+        self.classSheet.addRunspec(runspec, results)
 
 class Cell:
     def __init__(self):
         self.style = None
-    def protect(self, val):
+    def escape(self, val):
         return val.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 class StringCell(Cell):
@@ -135,9 +160,13 @@ class StringCell(Cell):
             self.val = ""
         else:
             self.val = val
+        # the escaped value (if already known)
+        self.text = None
 
     def printSheet(self, out):
-        out.write('<table:table-cell office:value-type="string"><text:p>{0}</text:p></table:table-cell>'.format(self.protect(self.val)))
+        text = self.text
+        if text == None: text = self.escape(self.val)
+        out.write('<table:table-cell office:value-type="string"><text:p>{0}</text:p></table:table-cell>'.format(text))
 
 class FloatCell(Cell):
     def __init__(self, val):
@@ -156,6 +185,9 @@ class FormulaCell(Cell):
         Cell.__init__(self)
         self.val       = val
         self.arrayForm = arrayForm
+        # formulas are (almost) never repeated, hence,
+        # they are escaped once here and not cached
+        self.formula   = self.escape(val)
 
     def printSheet(self, out):
         extra = ""
@@ -163,42 +195,70 @@ class FormulaCell(Cell):
             extra += ' table:style-name="{0}"'.format(self.style)
         if self.arrayForm:
             extra += ' table:number-matrix-columns-spanned="1" table:number-matrix-rows-spanned="1"'
-        out.write('<table:table-cell{1} table:formula="{0}" office:value-type="float"/>'.format(self.protect(self.val), extra))
+        out.write('<table:table-cell{1} table:formula="{0}" office:value-type="float"/>'.format(self.formula, extra))
+
+def columnName(col):
+    """
+    Returns the letter-based name of the given (zero-based) column.
+    """
+    radix = ord("Z") - ord("A") + 1
+    ret   = ""
+    while col >= 0:
+        rem = col % radix
+        ret = chr(rem + ord("A")) + ret
+        col = col // radix - 1
+    return ret
+
+# cell references are generated for every formula,
+# so the names of the columns in use are memoized
+columnNames = {}
 
 class Table:
     def __init__(self, name):
         self.content = []
         self.cowidth = []
         self.name    = name
+        self.labels  = {}
 
     def add(self, row, col, cell):
         # estimate some "good" column width
-        while len(self.cowidth) <= col + 1:
-            self.cowidth.append(0.8925)
+        if len(self.cowidth) <= col + 1:
+            self.cowidth.extend([0.8925] * (col + 2 - len(self.cowidth)))
         if cell.__class__ == StringCell:
             self.cowidth[col] = max(self.cowidth[col], len(cell.val) * 0.069 + 0.1)
-        while len(self.content) <= row:
-            self.content.append([])
+        if len(self.content) <= row:
+            self.content.extend([] for _ in range(len(self.content), row + 1))
         rowRef = self.content[row]
-        while len(rowRef) <= col:
-            rowRef.append(None)
+        if len(rowRef) <= col:
+            rowRef.extend([None] * (col + 1 - len(rowRef)))
         rowRef[col] = cell
 
+    def addLabel(self, row, col, val):
+        # measure names label every column of a system,
+        # so each is escaped only once per table
+        cell = StringCell(val)
+        text = self.labels.get(val)
+        if text == None:
+            text = cell.escape(val)
+            self.labels[val] = text
+        cell.text = text
+        self.add(row, col, cell)
+
     def get(self, row, col):
         return self.content[row][col]
 
+    def colIndex(self, col, absCol = False):
+        ret = columnNames.get(col)
+        if ret == None:
+            ret = columnName(col)
+            columnNames[col] = ret
+        if absCol: return "$" + ret
+        return ret
+
     def cellIndex(self, row, col, absCol = False, absRow = False):
-        radix = ord("Z") - ord("A") + 1
-        ret   = ""
-        while col >= 0:
-            rem = col % radix
-            ret = chr(rem + ord("A")) + ret
-            col = col // radix - 1
-        if absCol: preCol = "$"
-        else: preCol = ""
         if absRow: preRow = "$"
         else: preRow = ""
-        return preCol + ret + preRow + str(row + 1)
+        return self.colIndex(col, absCol) + preRow + str(row + 1)
 
     def printSheet(self, out, name):
         out.write('<table:table table:name="{0}" table:style-name="ta1" table:print="false">'.format(name))
@@ -215,63 +275,58 @@ class Table:
         out.write('</table:table>')
 
 class ValueRows:
+    # the spread of values (max-min for best and max-median for worst
+    # values) a row must exceed before cells are highlighted per function
+    gaps = {"t": (2, 2), "to": (0, None)}
+
     def __init__(self, highlight):
         self.highlight = highlight
         self.list      = {}
 
     def __iter__(self):
         for name, valList in self.list.items():
-            if name in self.highlight:
-                func = self.highlight[name]
-                for line in range(0, len(valList)):
-                    row = sorted(valList[line])
-                    if len(row) > 1:
-                        minimum = row[0][0]
-                        median  = tools.medianSorted(list(map(lambda x: x[0], row)))
-                        maximum = row[-1][0]
-                        green   = []
-                        red     = []
-                        if func == "t":
-                            if maximum - minimum > 2:
-                                for value, col in row:
-                                    if value <= minimum and value < median:
-                                        green.append(col)
-                                    else:
-                                        break
-                            if maximum - median > 2:
-                                for value, col in reversed(row):
-                                    if value >= maximum and value > median:
-                                        red.append(col)
-                                    else:
-                                        break
-                        elif func == "to":
-                            if maximum - minimum > 0:
-                                for value, col in row:
-                                    if value <= minimum and value < median:
-                                        green.append(col)
-                                    else:
-                                        break
-                            for value, col in reversed(row):
-                                if value > median and value >= maximum:
-                                    red.append(col)
-                                else:
-                                    break
-                        yield name, line, green, red
+            func = self.highlight.get(name)
+            if not func in self.gaps:
+                continue
+            bestGap, worstGap = self.gaps[func]
+            for line in range(0, len(valList)):
+                row = sorted(valList[line])
+                if len(row) > 1:
+                    values  = [value for value, _ in row]
+                    minimum = values[0]
+                    median  = tools.medianSorted(values)
+                    maximum = values[-1]
+                    green   = []
+                    red     = []
+                    if maximum - minimum > bestGap:
+                        for value, col in row:
+                            if value <= minimum and value < median:
+                                green.append(col)
+                            else:
+                                break
+                    if worstGap == None or maximum - median > worstGap:
+                        for value, col in reversed(row):
+                            if value >= maximum and value > median:
+                                red.append(col)
+                            else:
+                                break
+                    yield name, line, green, red
 
     def add(self, name, val, line, col):
-        if not name in self.list: self.list[name] = []
-        valList =  self.list[name]
-        while len(valList) <= line: valList.append([])
+        valList = self.list.setdefault(name, [])
+        if len(valList) <= line: valList.extend([] for _ in range(len(valList), line + 1))
         valList[line].append((val,col))
 
     def map(self, name, line, func):
-        if not name in self.list:
+        valList = self.list.get(name)
+        if valList == None:
             return None
-        if line >= len(self.list[name]):
+        if line >= len(valList):
             return None
-        if len(self.list[name][line]) == 0:
+        row = valList[line]
+        if len(row) == 0:
             return None
-        return func(list(map(lambda x: x[0], self.list[name][line])))
+        return func([value for value, _ in row])
 
 class ResultTable(Table):
     def __init__(self, benchmark, measures, name, instanceTable = None):
@@ -307,10 +362,17 @@ class ResultTable(Table):
     def getOffset(self, column, name):
         return self.systemColumns[(column.setting, column.machine)].columns[name].offset
 
+    def colRange(self, col, absCol = False):
+        """
+        Returns a reference to the result rows of the given column.
+        """
+        return "[.{0}:.{1}]".format(self.cellIndex(2, col, absCol), self.cellIndex(self.resultOffset - 1, col, absCol))
+
     def addFooter(self, col):
-        self.add(self.resultOffset + 1, col, FormulaCell("of:=SUM([.{0}:.{1}])".format(self.cellIndex(2, col), self.cellIndex(self.resultOffset - 1, col))))
-        self.add(self.resultOffset + 2, col, FormulaCell("of:=AVERAGE([.{0}:.{1}])".format(self.cellIndex(2, col), self.cellIndex(self.resultOffset - 1, col))))
-        self.add(self.resultOffset + 3, col, FormulaCell("of:=STDEV([.{0}:.{1}])".format(self.cellIndex(2, col), self.cellIndex(self.resultOffset - 1, col))))
+        colRange = self.colRange(col)
+        self.add(self.resultOffset + 1, col, FormulaCell("of:=SUM({0})".format(colRange)))
+        self.add(self.resultOffset + 2, col, FormulaCell("of:=AVERAGE({0})".format(colRange)))
+        self.add(self.resultOffset + 3, col, FormulaCell("of:=STDEV({0})".format(colRange)))
 
     def finish(self):
         col = 1
@@ -323,34 +385,31 @@ class ResultTable(Table):
             for column in systemColumn.iter(self.measures):
                 name = column.name
                 column.offset = col
-                self.add(1, col, StringCell(name))
+                self.addLabel(1, col, name)
+                if column.type == "classresult":
+                    # only the instance rows differ between the formulas of a column
+                    op = "AVERAGE"
+                    if (name == "timeout"): op = "SUM"
+                    instCol = self.colIndex(self.getOffset(systemColumn, name))
+                    instTemplate = "of:=" + op + "([Instances." + instCol + "{0}:Instances." + instCol + "{1}])"
                 for line in range(0, len(column.content)):
                     value = column.content[line]
                     if value.__class__ == tuple:
                         column.content[line] = value[1]
-                        op = "AVERAGE"
-                        if (name == "timeout"): op = "SUM"
-                        self.add(2 + line, col, FormulaCell("of:="+op+"([Instances.{0}:Instances.{1}])".format(self.cellIndex(value[0].instStart + 2, self.getOffset(systemColumn, name)), self.cellIndex(value[0].instEnd + 2, self.getOffset(systemColumn, name)))))
+                        self.add(2 + line, col, FormulaCell(instTemplate.format(value[0].instStart + 3, value[0].instEnd + 3)))
                         valueRows.add(name, value[1], line, col)
                     elif value.__class__ == float:
                         self.add(2 + line, col, FloatCell(value))
                         valueRows.add(name, value, line, col)
                     else:
                         self.add(2 + line, col, StringCell(value))
-                if column.type == "classresult":
-                    if not name in floatOccur:
-                        floatOccur[name] = set()
-                    floatOccur[name].add(col)
-                    self.addFooter(col)
-                elif column.type == "float":
-                    if not name in floatOccur:
-                        floatOccur[name] = set()
-                    floatOccur[name].add(col)
+                if column.type == "classresult" or column.type == "float":
+                    floatOccur.setdefault(name, set()).add(col)
                     self.addFooter(col)
                 col += 1
 
         resultColumns = []
-        for colName in ["min", "median", "max"]:
+        for colName, func in [("min", min), ("median", tools.median), ("max", max)]:
             column = SystemColumn(None, None)
             column .offset = col
             self.add(0, col, StringCell(colName))
@@ -361,78 +420,44 @@ class ResultTable(Table):
                 measures = map(lambda x: x[0], self.measures)
             for name in measures:
                 if name in floatOccur:
-                    self.add(1, col, StringCell(name))
+                    self.addLabel(1, col, name)
+                    colRefs = sorted(floatOccur[name])
+                    # only the row part of the references changes per row
+                    colIndices = [self.colIndex(colRef, True) for colRef in colRefs]
+                    # columns without any values (e.g., if all runs failed)
+                    # do not need to be summarized row by row
+                    hasValues = name in valueRows.list
                     for row in range(2, self.resultOffset):
-                        minRange = ""
-                        for colRef in sorted(floatOccur[name]):
-                            if minRange != "":
-                                minRange += ";"
-                            minRange += "[.{0}]".format(self.cellIndex(row, colRef, True))
+                        rowIndex = str(row + 1)
+                        minRange = ";".join(["[.{0}{1}]".format(colIndex, rowIndex) for colIndex in colIndices])
                         self.add(row, col, FormulaCell("of:={1}({0})".format(minRange, colName.upper())))
-                        self.addFooter(col)
-                        if colName == "min":      column.addCell(row - 2, name, "float", valueRows.map(name, row - 2, min))
-                        elif colName == "median": column.addCell(row - 2, name, "float", valueRows.map(name, row - 2, tools.median))
-                        elif colName == "max":    column.addCell(row - 2, name, "float", valueRows.map(name, row - 2, max))
-                    for colRef in sorted(floatOccur[name]):
+                        value = None
+                        if hasValues: value = valueRows.map(name, row - 2, func)
+                        column.addCell(row - 2, name, "float", value)
+                    # tables without result rows get no footer (its range would be empty)
+                    if self.resultOffset > 2: self.addFooter(col)
+                    # the range of the result column is shared by all its formulas
+                    resRange = self.colRange(col, True)
+                    for colRef in colRefs:
+                        refRange = self.colRange(colRef)
                         if colName == "min":
-                            self.add(
-                                self.resultOffset + 4,
-                                colRef,
-                                FormulaCell(
-                                    "of:=SUM(([.{0}:.{1}]-[.{2}:.{3}])^2)^0.5".format(
-                                        self.cellIndex(2, colRef),
-                                        self.cellIndex(self.resultOffset - 1, colRef),
-                                        self.cellIndex(2, col, True),
-                                        self.cellIndex(self.resultOffset - 1, col, True)),
-                                    True))
-                            self.add(
-                                self.resultOffset + 5,
-                                colRef,
-                                FormulaCell(
-                                    "of:=SUM([.{0}:.{1}]=[.{2}:.{3}])".format(
-                                        self.cellIndex(2, colRef),
-                                        self.cellIndex(self.resultOffset - 1, colRef),
-                                        self.cellIndex(2, col, True),
-                                        self.cellIndex(self.resultOffset - 1, col, True)),
-                                    True))
+                            self.add(self.resultOffset + 4, colRef, FormulaCell("of:=SUM(({0}-{1})^2)^0.5".format(refRange, resRange), True))
+                            self.add(self.resultOffset + 5, colRef, FormulaCell("of:=SUM({0}={1})".format(refRange, resRange), True))
                         elif colName == "median":
-                            self.add(
-                                    self.resultOffset + 6,
-                                    colRef,
-                                    FormulaCell(
-                                        "of:=SUM([.{0}:.{1}]<[.{2}:.{3}])".format(
-                                            self.cellIndex(2, colRef),
-                                            self.cellIndex(self.resultOffset - 1, colRef),
-                                            self.cellIndex(2, col, True),
-                                            self.cellIndex(self.resultOffset - 1, col, True)),
-                                        True))
-                            self.add(
-                                    self.resultOffset + 7,
-                                    colRef,
-                                    FormulaCell(
-                                        "of:=SUM([.{0}:.{1}]>[.{2}:.{3}])".format(
-                                            self.cellIndex(2, colRef),
-                                            self.cellIndex(self.resultOffset - 1, colRef),
-                                            self.cellIndex(2, col, True),
-                                            self.cellIndex(self.resultOffset - 1, col, True)),
-                                        True))
+                            self.add(self.resultOffset + 6, colRef, FormulaCell("of:=SUM({0}<{1})".format(refRange, resRange), True))
+                            self.add(self.resultOffset + 7, colRef, FormulaCell("of:=SUM({0}>{1})".format(refRange, resRange), True))
                         elif colName == "max":
-                            self.add(
-                                    self.resultOffset + 8,
-                                    colRef,
-                                    FormulaCell(
-                                        "of:=SUM([.{0}:.{1}]=[.{2}:.{3}])".format(
-                                            self.cellIndex(2, colRef),
-                                            self.cellIndex(self.resultOffset - 1, colRef),
-                                            self.cellIndex(2, col, True),
-                                            self.cellIndex(self.resultOffset - 1, col, True)),
-                                        True))
+                            self.add(self.resultOffset + 8, colRef, FormulaCell("of:=SUM({0}={1})".format(refRange, resRange), True))
                     col+= 1
-            column.calcSummary(self.resultOffset - 2, [])
+            column.calcSummary(self.resultOffset - 2, {})
 
         # calc values for the footers
+        # (the min, median, and max columns are shared by all system columns)
+        refs = {}
+        for name in resultColumns[0].columns:
+            refs[name] = [column.columns[name].content for column in resultColumns]
         for systemColumn in self.systemColumns.values():
-            systemColumn.calcSummary(self.resultOffset - 2, resultColumns)
+            systemColumn.calcSummary(self.resultOffset - 2, refs)
             for column in systemColumn.columns.values():
                 valueRows.add(column.name, column.summary.sum, self.resultOffset - 2 + 1, column.offset)
                 valueRows.add(column.name, column.summary.avg, self.resultOffset - 2 + 2, column.offset)
@@ -445,37 +470,33 @@ class ResultTable(Table):
 
         # apply some styles to the instance sheet
         for name, line, red, green in valueRows:
+            rowRef = self.content[2 + line]
             for i in red:
-                cell = self.get(2 + line, i)
-                cell.style = "cellBest"
+                rowRef[i].style = "cellBest"
             for i in green:
-                cell = self.get(2 + line, i)
-                cell.style = "cellWorst"
+                rowRef[i].style = "cellWorst"
 
-    def addRunspec(self, runspec):
+    def addRunspec(self, runspec, results):
         key = (runspec.setting, runspec.machine)
         if not key in self.systemColumns:
             self.systemColumns[key] = SystemColumn(runspec.setting, runspec.machine)
         column = self.systemColumns[key]
         self.machines.add(column.machine)
-        for classresult in runspec:
-            classSum = {}
-            for instresult in classresult:
-                for run in instresult:
-                    for name, valueType, value in run.iter(self.measures):
-                        if valueType != "float": valueType = "string"
-                        if self.instanceTable == None:
-                            column.addCell(instresult.instance.line + run.number - 1, name, valueType, value)
-                        elif valueType == "float":
-                            if not name in classSum:
-                                classSum[name] = (0.0, 0)
-                            classSum[name] = (float(value) + classSum[name][0], 1 + classSum[name][1])
-
-            if not self.instanceTable == None:
+        for benchclass, cells in results:
+            if self.instanceTable == None:
+                for line, name, valueType, value in cells:
+                    column.addCell(line, name, valueType, value)
+            else:
+                classSum = {}
+                for _, name, valueType, value in cells:
+                    if valueType == "float":
+                        if not name in classSum:
+                            classSum[name] = (0.0, 0)
+                        classSum[name] = (value + classSum[name][0], 1 + classSum[name][1])
                 for name, value in classSum.items():
                     resTemp = value[0] / value[1]
                     if (name == "timeout"): resTemp = value[0]
-                    column.addCell(classresult.benchclass.line, name, "classresult", (classresult.benchclass, resTemp))
+                    column.addCell(benchclass.line, name, "classresult", (benchclass, resTemp))
 
 class Summary:
     def __init__(self):
@@ -493,10 +514,9 @@ class Summary:
     def calc(self, n, colA, minmum, median, maximum):
         self.avg = self.sum / self.count
         self.dev = math.sqrt(self.sqsum / self.count - self.avg * self.avg)
-        colA.extend([None for _ in range(0,  - len(colA))])
         # geometric distance, best
         if minmum != None:
-            minmum.extend([None for _ in range(0, self.count - len(minmum))])
+            minmum.extend([None] * (self.count - len(minmum)))
             sdsum = 0
             for a, b in zip(colA, minmum):
                 if a != None:
@@ -506,7 +526,7 @@ class Summary:
             self.dst = math.sqrt(sdsum)
         # better, worse
         if median != None:
-            median.extend([None for _ in range(0, self.count - len(median))])
+            median.extend([None] * (self.count - len(median)))
             for a, b in zip(colA, median):
                 if a != None:
                     if a < b:
@@ -515,7 +535,7 @@ class Summary:
                         self.worse += 1
         # worst
         if maximum != None:
-            maximum.extend([None for _ in range(0, self.count - len(maximum))])
+            maximum.extend([None] * (self.count - len(maximum)))
             for a, b in zip(colA, maximum):
                 if a != None and a >= b:
                     self.worst += 1
@@ -535,12 +555,12 @@ class ValueColumn:
 
     def addCell(self, line, value):
         if self.type == "classresult":
-            self.summary.add(float(value[1]))
+            self.summary.add(value[1])
         elif self.type == "float" and value != None:
             value = float(value)
             self.summary.add(value)
-        while len(self.content) <= line:
-            self.content.append(None)
+        if len(self.content) <= line:
+            self.content.extend([None] * (line + 1 - len(self.content)))
         self.content[line] = value
 
 class SystemColumn(Sortable):
@@ -571,13 +591,11 @@ class SystemColumn(Sortable):
                 if name in self.columns:
                     yield self.columns[name]
 
-    def calcSummary(self, n, ref):
+    def calcSummary(self, n, refs):
         for name, column in self.columns.items():
             minimum = maximum = median = None
-            if len(ref) == 3:
-                minimum = ref[0].columns[name].content
-                maximum = ref[1].columns[name].content
-                median  = ref[2].columns[name].content
+            if len(refs) > 0:
+                minimum, maximum, median = refs[name]
             column.summary.calc(n, column.content, minimum, maximum, median)
 
     def addCell(self, line, name, valueType, value):
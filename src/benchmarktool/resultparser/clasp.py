@@ -7,21 +7,79 @@ Created on Jan 17, 2010
 import os
 import re
 import sys
-import codecs
+import mmap
 
 clasp_re = {
-    "models"      : ("float", re.compile(r"^(c )?Models[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "choices"     : ("float", re.compile(r"^(c )?Choices[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "time"        : ("float", re.compile(r"^(Real time \(s\):|\[runlim\] real:)\s*(?P<val>[0-9]+(\.[0-9]+)?)")),
-    "conflicts"   : ("float", re.compile(r"^(c )?Conflicts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "restarts"    : ("float", re.compile(r"^(c )?Restarts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "optimum"     : ("string", re.compile(r"^(c )?Optimization[ ]*:[ ]*(?P<val>(-?[0-9]+)( -?[0-9]+)*)[ ]*$")),
-    "status"      : ("string", re.compile(r"^(s )?(?P<val>SATISFIABLE|UNSATISFIABLE|UNKNOWN|OPTIMUM FOUND)[ ]*$")),
-    "interrupted" : ("string", re.compile(r"(c )?(?P<val>INTERRUPTED!)")),
-    "error"       : ("string", re.compile(r"^\*\*\* clasp ERROR: (?P<val>.*)$")),
-    "memerror"    : ("string", re.compile(r"^(Maximum VSize exceeded|\[runlim\] status:\s*out of memory)(?P<val>.*)")),
+    "models"      : ("float", re.compile(r"Models[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "choices"     : ("float", re.compile(r"Choices[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "time"        : ("float", re.compile(r"(Real time \(s\):|\[runlim\] real:)[^\S\r\n]*(?P<val>[0-9]+(\.[0-9]+)?)")),
+    "conflicts"   : ("float", re.compile(r"Conflicts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "restarts"    : ("float", re.compile(r"Restarts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "optimum"     : ("string", re.compile(r"Optimization[ ]*:[ ]*(?P<val>(-?[0-9]+)( -?[0-9]+)*)[ ]*$")),
+    "status"      : ("string", re.compile(r"(?P<val>SATISFIABLE|UNSATISFIABLE|UNKNOWN|OPTIMUM FOUND)[ ]*$")),
+    "interrupted" : ("string", re.compile(r"(?P<val>INTERRUPTED!)")),
+    "error"       : ("string", re.compile(r"\*\*\* clasp ERROR: (?P<val>[^\r\n]*(?:\r|$))")),
+    "memerror"    : ("string", re.compile(r"(Maximum VSize exceeded|\[runlim\] status:[^\S\r\n]*out of memory)(?P<val>[^\r\n]*(?:\r|$))")),
 }
 
+# optional prefixes that may precede a pattern at the beginning of a line
+clasp_prefix = {
+    "models"      : "c ",
+    "choices"     : "c ",
+    "conflicts"   : "c ",
+    "restarts"    : "c ",
+    "optimum"     : "c ",
+    "interrupted" : "c ",
+    "status"      : "s ",
+}
+
+def combinePatterns(patterns, prefixes):
+    """
+    Combines line patterns into one pattern that scans whole log files.
+    The alternation is anchored at the beginning of lines, which start
+    after a newline or a lone carriage return (as used by progress output).
+    The value of pattern "key" is captured by group "key_val".
+    
+    Keyword arguments:
+    patterns - A dictionary mapping keys to pairs of value types and patterns
+    prefixes - A dictionary mapping keys to optional line prefixes
+    """
+    # (?<![^\r\n]) holds at the beginning of the file and after \n or \r
+    return re.compile(r"(?<![^\r\n])(?:{0})".format("|".join(
+        "(?P<{0}>{1}{2})".format(
+            key,
+            "(?:{0})?".format(prefixes[key]) if key in prefixes else "",
+            reg[1].pattern.replace("(?P<val>", "(?P<{0}_val>".format(key)))
+        for key, reg in patterns.items())).encode("utf-8"), re.MULTILINE)
+
+def scanLog(fileName, pattern, patterns, res):
+    """
+    Scans a log file in one pass and stores the last value 
+    found for each key in res.
+    
+    Keyword arguments:
+    fileName - The name of the log file
+    pattern  - A pattern created by combinePatterns
+    patterns - The patterns the combined pattern was created from
+    res      - A dictionary mapping keys to pairs of value types and values
+    """
+    with open(fileName, "rb") as log:
+        try:
+            content = mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            return
+        try:
+            for m in pattern.finditer(content):
+                val     = m.lastgroup
+                valType = patterns[val][0]
+                text    = m.group(val + "_val").decode("utf-8", "ignore")
+                res[val] = (valType, float(text) if valType == "float" else text)
+        finally:
+            content.close()
+
+clasp_any = combinePatterns(clasp_re, clasp_prefix)
+
 def clasp(root, runspec, instance):
     """
     Extracts some clasp statistics.
@@ -30,19 +88,17 @@ def clasp(root, runspec, instance):
     timeout = runspec.project.job.timeout
     res     = { "time": ("float", timeout) }
     for f in ["runsolver.solver", "runsolver.watcher"]:
-        for line in codecs.open(os.path.join(root, f), errors='ignore', encoding='utf-8'):
-            for val, reg in clasp_re.items():
-                m = reg[1].match(line)
-                if m: res[val] = (reg[0], float(m.group("val")) if reg[0] == "float" else m.group("val"))
+        scanLog(os.path.join(root, f), clasp_any, clasp_re, res)
 
     if "memerror" in res:
         res["error"]  = ("string", "std::bad_alloc")
         res["status"] = ("string", "UNKNOWN")
         del res["memerror"]
     result   = []
-    error    = not "status" in res or ("error" in res and res["error"][1] != "std::bad_alloc")
-    memout   = "error" in res and res["error"][1] == "std::bad_alloc"
     status   = res["status"][1] if "status" in res else None
+    errorMsg = res["error"][1] if "error" in res else None
+    memout   = errorMsg == "std::bad_alloc"
+    error    = status == None or (errorMsg != None and not memout)
     timedout = memout or error or status == "UNKNOWN" or (status == "SATISFIABLE" and "optimum" in res) or res["time"][1] >= timeout or "interrupted" in res;
     if timedout: res["time"] = ("float", timeout)
     if error: sys.stderr.write("*** ERROR: Run {0} failed with unrecognized status or error!\n".format(root))
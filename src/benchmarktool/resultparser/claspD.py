@@ -19,23 +19,36 @@ function in clasp, but not in claspD implemented:
 import os
 import re
 import sys
-import codecs
+
+from benchmarktool.resultparser.clasp import combinePatterns, scanLog
 
 clasp_re = {
-    "models"      : ("float", re.compile(r"^(c )?Models[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "choices"     : ("float", re.compile(r"^(c )?Choices[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "time"        : ("float", re.compile(r"^Real time \(s\): (?P<val>[0-9]+(\.[0-9]+)?)$")),
-    "conflicts"   : ("float", re.compile(r"^(c )?Conflicts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "restarts"    : ("float", re.compile(r"^(c )?Restarts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
-    "optimum"     : ("string", re.compile(r"^(c )?Optimization[ ]*:[ ]*(?P<val>(-?[0-9]+)( -?[0-9]+)*)[ ]*$")),
-    "interrupted" : ("string", re.compile(r"(c )?(?P<val>INTERRUPTED!)")),
-    "error"       : ("string", re.compile(r"^\*\*\* clasp ERROR: (?P<val>.*)$")),
-    "memerror"    : ("string", re.compile(r"^Maximum VSize (?P<val>exceeded): sending SIGTERM then SIGKILL")),
+    "models"      : ("float", re.compile(r"Models[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "choices"     : ("float", re.compile(r"Choices[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "time"        : ("float", re.compile(r"Real time \(s\): (?P<val>[0-9]+(\.[0-9]+)?)$")),
+    "conflicts"   : ("float", re.compile(r"Conflicts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "restarts"    : ("float", re.compile(r"Restarts[ ]*:[ ]*(?P<val>[0-9]+)\+?[ ]*$")),
+    "optimum"     : ("string", re.compile(r"Optimization[ ]*:[ ]*(?P<val>(-?[0-9]+)( -?[0-9]+)*)[ ]*$")),
+    "interrupted" : ("string", re.compile(r"(?P<val>INTERRUPTED!)")),
+    "error"       : ("string", re.compile(r"\*\*\* clasp ERROR: (?P<val>[^\r\n]*(?:\r|$))")),
+    "memerror"    : ("string", re.compile(r"Maximum VSize (?P<val>exceeded): sending SIGTERM then SIGKILL")),
+
 
 
+}
 
+# optional prefixes that may precede a pattern at the beginning of a line
+clasp_prefix = {
+    "models"      : "c ",
+    "choices"     : "c ",
+    "conflicts"   : "c ",
+    "restarts"    : "c ",
+    "optimum"     : "c ",
+    "interrupted" : "c ",
 }
 
+clasp_any = combinePatterns(clasp_re, clasp_prefix)
+
 def claspD(root, runspec, instance):
     """
     Extracts some claspD statistics.
@@ -44,10 +57,7 @@ def claspD(root, runspec, instance):
     timeout = runspec.project.job.timeout
     res     = { "time": ("float", timeout) }
     for f in ["runsolver.solver", "runsolver.watcher"]:
-        for line in codecs.open(os.path.join(root, f), errors='ignore', encoding='utf-8'):
-            for val, reg in clasp_re.items():
-                m = reg[1].match(line)
-                if m: res[val] = (reg[0], float(m.group("val")) if reg[0] == "float" else m.group("val"))
+        scanLog(os.path.join(root, f), clasp_any, clasp_re, res)
 
     if "memerror" in res:
         res["error"]  = ("string", "std::bad_alloc")
@@ -15,6 +15,9 @@ clingo_re = {
     "memerror"    : ("string", re.compile(r"^Maximum VSize (?P<val>exceeded): sending SIGTERM then SIGKILL")),
 }
 
+# patterns as (name, type, isFloat, regex) tuples to avoid lookups in the per-line loop
+clingo_list = tuple((key, reg[0], reg[0] == "float", reg[1]) for key, reg in clingo_re.items())
+
 def clingo(root, runspec, instance):
     """
     Extracts some clingo statistics.
@@ -25,9 +28,12 @@ def clingo(root, runspec, instance):
     # {{{1 parse runsolver data
     for f in ["runsolver.watcher"]:
         for line in codecs.open(os.path.join(root, f), errors='ignore', encoding='utf-8'):
-            for val, reg in clingo_re.items():
-                m = reg[1].match(line)
-                if m: res[val] = (reg[0], float(m.group("val")) if reg[0] == "float" else m.group("val"))
+            for val, valType, isFloat, reg in clingo_list:
+                m = reg.match(line)
+                if m:
+                    # the patterns are mutually exclusive
+                    res[val] = (valType, float(m.group("val")) if isFloat else m.group("val"))
+                    break
 
     # {{{1 parse solver stdout
     # the runsolver combines both stderr and stdout
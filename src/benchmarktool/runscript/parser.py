@@ -11,27 +11,8 @@ import benchmarktool.tools as tools
 try: from StringIO import StringIO
 except: from io import StringIO
 
-class Parser:
-    """
-    A parser to parse xml runscript specifications.
-    """   
-    def __init__(self):
-        """
-        Initializes the parser.
-        """
-        pass
-    
-    def parse(self, fileName):
-        """
-        Parse a given runscript and return its representation 
-        in form of an instance of class Runscript.
-        
-        Keyword arguments:
-        fileName -- a string holding a path to a xml file  
-        """
-        from lxml import etree
-        
-        schemadoc = etree.parse(StringIO("""\
+# the xml schema of runscript specifications
+runscriptSchema = """\
 <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
     <!-- the runscript -->
     <xs:complexType name="runscriptType">
@@ -270,98 +251,153 @@ class Parser:
         </xs:unique>
     </xs:element>
 </xs:schema>
-"""))
-        schema = etree.XMLSchema(schemadoc)
+"""
+
+# attributes of jobs and settings that are not passed on as extra attributes
+pbsjobSkip  = frozenset(["name", "timeout", "runs", "ppn", "procs", "script_mode", "walltime", "cpt", "partition"])
+seqjobSkip  = frozenset(["name", "timeout", "runs", "parallel"])
+settingSkip = frozenset(["name", "cmdline", "tag"])
+
+class Parser:
+    """
+    A parser to parse xml runscript specifications.
+    """   
+    # the validator for runscripts (created on first use and shared by all parsers)
+    schema = None
 
-        doc = etree.parse(open(fileName))
-        schema.assertValid(doc)
+    def __init__(self):
+        """
+        Initializes the parser.
+        """
+        pass
+    
+    def parse(self, fileName):
+        """
+        Parse a given runscript and return its representation 
+        in form of an instance of class Runscript.
+        
+        Keyword arguments:
+        fileName -- a string holding a path to a xml file  
+        """
+        from lxml import etree
+        
+        if Parser.schema == None:
+            Parser.schema = etree.XMLSchema(etree.parse(StringIO(runscriptSchema)))
+
+        # the document is validated while it is parsed (with a fresh
+        # parser, so that its error log only holds this document's errors)
+        try:
+            # ids, comments, and processing instructions are not needed by the parser below
+            doc = etree.parse(fileName, etree.XMLParser(schema = Parser.schema, remove_blank_text = True, collect_ids = False, remove_comments = True, remove_pis = True))
+        except etree.XMLSyntaxError:
+            # schema errors found while parsing carry no line numbers,
+            # so invalid documents are validated again to report them
+            Parser.schema.assertValid(etree.parse(fileName))
+            raise
         
         root = doc.getroot()
         run  = Runscript(root.get("output"))
 
-        for node in root.xpath("./pbsjob"):
-            attr = self._filterAttr(node, ["name", "timeout", "runs", "ppn", "procs", "script_mode", "walltime", "cpt", "partition"])
+        # collect the top-level elements by tag in a single pass
+        # (they are processed in a fixed order below because later
+        # elements refer to earlier ones, e.g., projects to jobs)
+        elements = {}
+        for node in root.iterchildren(tag=etree.Element):
+            elements.setdefault(node.tag, []).append(node)
+
+        for node in elements.get("pbsjob", []):
+            attr   = self._filterAttr(node, pbsjobSkip)
+            attrib = node.attrib
         
-            partition = node.get("partition")
+            partition = attrib.get("partition")
             if partition == None:
                 partition = "kr"
 
-            job = PbsJob(node.get("name"), tools.xmlTime(node.get("timeout")), int(node.get("runs")), node.get("script_mode"), tools.xmlTime(node.get("walltime")), int(node.get("cpt")), partition, attr)
+            job = PbsJob(attrib["name"], tools.xmlTime(attrib["timeout"]), int(attrib["runs"]), attrib["script_mode"], tools.xmlTime(attrib["walltime"]), int(attrib["cpt"]), partition, attr)
             run.addJob(job)
 
-        for node in root.xpath("./seqjob"):
-            attr = self._filterAttr(node, ["name", "timeout", "runs", "parallel"])
-            job = SeqJob(node.get("name"), tools.xmlTime(node.get("timeout")), int(node.get("runs")), int(node.get("parallel")), attr)
+        for node in elements.get("seqjob", []):
+            attr   = self._filterAttr(node, seqjobSkip)
+            attrib = node.attrib
+            job    = SeqJob(attrib["name"], tools.xmlTime(attrib["timeout"]), int(attrib["runs"]), int(attrib["parallel"]), attr)
             run.addJob(job)
         
-        for node in root.xpath("./machine"):
-            machine = Machine(node.get("name"), node.get("cpu"), node.get("memory"))
+        for node in elements.get("machine", []):
+            attrib  = node.attrib
+            machine = Machine(attrib["name"], attrib["cpu"], attrib["memory"])
             run.addMachine(machine)
 
-        for node in root.xpath("./config"):
-            config = Config(node.get("name"), node.get("template"))
+        for node in elements.get("config", []):
+            attrib = node.attrib
+            config = Config(attrib["name"], attrib["template"])
             run.addConfig(config)
         
         compoundSettings = {}
+        # the same tag lists typically occur for many settings,
+        # so equal lists share one set (for this runscript only)
+        tagSets = {}
         sytemOrder = 0 
-        for node in root.xpath("./system"):
-            system = System(node.get("name"), node.get("version"), node.get("measures"), sytemOrder)
+        for node in elements.get("system", []):
+            attrib = node.attrib
+            system = System(attrib["name"], attrib["version"], attrib["measures"], sytemOrder)
             settingOrder = 0
-            for child in node.xpath("setting"):
-                attr = self._filterAttr(child, ["name", "cmdline", "tag"])
-                compoundSettings[child.get("name")] = []
-                if "procs" in attr:
-                    procs = [int(proc) for proc in attr["procs"].split(None)]
-                    del attr["procs"]
-                else: procs = [None]
-                if "ppn" in attr: 
-                    ppn = int(attr["ppn"])
-                    del attr["ppn"]
-                else: ppn = None
-                if "pbstemplate" in attr:
-                    pbstemplate = attr["pbstemplate"]
-                    del attr["pbstemplate"]
-                else: pbstemplate = "templates/single.pbs"
-                if child.get("tag") == None: tag = set()
-                else: tag = set(child.get("tag").split(None))
+            for child in node.iterchildren(tag="setting"):
+                attr = self._filterAttr(child, settingSkip)
+                childAttrib = child.attrib
+                settingName = childAttrib["name"]
+                cmdline     = childAttrib.get("cmdline")
+                procs       = attr.pop("procs", None)
+                ppn         = attr.pop("ppn", None)
+                pbstemplate = attr.pop("pbstemplate", "templates/single.pbs")
+                if procs != None: procs = [int(proc) for proc in procs.split(None)]
+                if ppn != None: ppn = int(ppn)
+                tagRep = childAttrib.get("tag")
+                tag    = tagSets.get(tagRep)
+                if tag == None:
+                    tag = tools.splitSet(tagRep)
+                    tagSets[tagRep] = tag
+                if procs == None:
+                    # the common case of a setting that is not split by processes
+                    compoundSettings[settingName] = [settingName]
+                    system.addSetting(Setting(settingName, cmdline, tag, settingOrder, None, ppn, pbstemplate, attr))
+                    settingOrder += 1
+                    continue
+                settings = []
                 for num in procs:
-                    name = child.get("name")
-                    if num != None: 
-                        name += "-n{0}".format(num)
-                    compoundSettings[child.get("name")].append(name)
-                    setting = Setting(name, child.get("cmdline"), tag, settingOrder, num, ppn, pbstemplate, attr)
-                    system.addSetting(setting)
+                    settings.append(Setting(settingName + "-n{0}".format(num), cmdline, tag, settingOrder, num, ppn, pbstemplate, attr))
                     settingOrder += 1
+                compoundSettings[settingName] = [setting.name for setting in settings]
+                system.addSettings(settings)
 
-            run.addSystem(system, node.get("config"))
+            run.addSystem(system, attrib["config"])
             sytemOrder += 1
             
-        for node in root.xpath("./benchmark"):
+        for node in elements.get("benchmark", []):
             benchmark = Benchmark(node.get("name"))
-            for child in node.xpath("./folder"):
+            for child in node.iterchildren(tag="folder"):
                 element = Benchmark.Folder(child.get("path"))
-                for grandchild in child.xpath("./ignore"):
+                for grandchild in child.iterchildren(tag="ignore"):
                     element.addIgnore(grandchild.get("prefix"))
                 benchmark.addElement(element)
-            for child in node.xpath("./files"):
+            for child in node.iterchildren(tag="files"):
                 element = Benchmark.Files(child.get("path"))
-                for grandchild in child.xpath("./add"):
+                for grandchild in child.iterchildren(tag="add"):
                     element.addFile(grandchild.get("file"))
                 benchmark.addElement(element)
             run.addBenchmark(benchmark)
         
-        for node in root.xpath("./project"):
+        for node in elements.get("project", []):
             project = Project(node.get("name"))
             run.addProject(project, node.get("job"))
-            for child in node.xpath("./runspec"):
+            for child in node.iterchildren(tag="runspec"):
+                machine   = child.get("machine")
+                system    = child.get("system")
+                version   = child.get("version")
+                benchmark = child.get("benchmark")
                 for setting in compoundSettings[child.get("setting")]: 
-                    project.addRunspec(child.get("machine"),
-                                       child.get("system"),
-                                       child.get("version"),
-                                       setting,
-                                       child.get("benchmark"))
+                    project.addRunspec(machine, system, version, setting, benchmark)
                 
-            for child in node.xpath("./runtag"):
+            for child in node.iterchildren(tag="runtag"):
                 project.addRuntag(child.get("machine"), 
                                   child.get("benchmark"),
                                   child.get("tag"))
@@ -373,8 +409,4 @@ class Parser:
         Returns a dictionary containing all attributes of a given node.
         Attributes whose name occurs in the set skip are ignored.
         """
-        attr = {}
-        for key, val in node.items():
-            if not key in skip:
-                attr[key] = val  
-        return attr
+        return dict((key, val) for key, val in node.items() if not key in skip)
@@ -15,6 +15,157 @@ from benchmarktool.tools import Sortable, cmp
 import benchmarktool.config #@UnusedImport
 # pylint: enable-msg=W0611
 
+# start script for sequential jobs (see SeqScriptGen.genStartScript)
+seqStartTemplate = """\
+#!/usr/bin/python -u
+
+import optparse
+import threading
+import subprocess
+import os
+import sys
+import signal
+import time
+
+queue = [%(queue)s]
+
+class Main:
+    def __init__(self):
+        self.running  = set()
+        self.cores    = set()
+        self.started  = 0
+        self.total    = None
+        self.finished = threading.Condition()
+        self.coreLock = threading.Lock()
+        c = 0
+        while len(self.cores) < %(parallel)s:
+            self.cores.add(c)
+            c += 1
+    
+    def finish(self, thread):
+        self.finished.acquire()
+        self.running.remove(thread)
+        with self.coreLock:
+            self.cores.add(thread.core)
+        self.finished.notify()
+        self.finished.release()
+   
+    def start(self, cmd):
+        core     = 0
+        with self.coreLock:
+            core = self.cores.pop()
+        thread = Run(cmd, self, core)
+        self.started += 1
+        self.running.add(thread)
+        print("({0}/{1}/{2}/{4}) {3}".format(len(self.running), self.started, self.total, cmd, core))
+        thread.start()
+    
+    def run(self, queue):
+        signal.signal(signal.SIGTERM, self.exit)
+        signal.signal(signal.SIGINT, self.exit)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        self.finished.acquire()
+        self.total = len(queue)
+        for cmd in queue:
+            while len(self.running) >= %(parallel)s:
+                self.finished.wait()
+            self.start(cmd)
+        while len(self.running) != 0:
+            self.finished.wait()
+        self.finished.release()
+
+    def exit(self, *args):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        print("WARNING: it is not guaranteed that all processes will be terminated!")
+        print("sending sigterm ...")
+        os.killpg(os.getpgid(0), signal.SIGTERM)
+        print("waiting 10s...")
+        time.sleep(10)
+        print("sending sigkill ...")
+        os.killpg(os.getpgid(0), signal.SIGKILL)
+
+class Run(threading.Thread):
+    def __init__(self, cmd, main, core):
+        threading.Thread.__init__(self)
+        self.cmd  = cmd
+        self.main = main
+        self.core = core
+        self.proc = None
+    
+    def run(self):
+        path, script = os.path.split(self.cmd)
+        openArgs = dict(cwd=path)
+        if sys.version_info[:3] >= (3,2,0):
+            openArgs["start_new_session"] = True
+        else:
+            openArgs["preexec_fn"] = os.setsid
+        self.proc = subprocess.Popen(["bash", script, str(self.core)], **openArgs)
+        self.proc.wait()
+        self.main.finish(self)
+
+def gui():
+    import Tkinter
+    class App:
+        def __init__(self):
+            root    = Tkinter.Tk()
+            frame   = Tkinter.Frame(root)
+            scrollx = Tkinter.Scrollbar(frame, orient=Tkinter.HORIZONTAL)
+            scrolly = Tkinter.Scrollbar(frame)
+            list    = Tkinter.Listbox(frame, selectmode=Tkinter.MULTIPLE)
+            
+            for script in queue:
+                list.insert(Tkinter.END, script)
+            
+            scrolly.config(command=list.yview)
+            scrollx.config(command=list.xview)
+            list.config(yscrollcommand=scrolly.set)
+            list.config(xscrollcommand=scrollx.set)
+                
+            scrolly.pack(side=Tkinter.RIGHT, fill=Tkinter.Y)
+            scrollx.pack(side=Tkinter.BOTTOM, fill=Tkinter.X)
+            list.pack(fill=Tkinter.BOTH, expand=1)
+            
+            button = Tkinter.Button(root, text='Run', command=self.pressed)
+            
+            frame.pack(fill=Tkinter.BOTH, expand=1)
+            button.pack(side=Tkinter.BOTTOM, fill=Tkinter.X)
+
+            self.root  = root
+            self.list  = list
+            self.run   = False
+            self.queue = [] 
+        
+        def pressed(self):
+            sel = self.list.curselection()
+            for index in sel:
+                global queue
+                self.queue.append(queue[int(index)])
+            self.root.destroy()
+
+        def start(self):
+            self.root.mainloop()
+            return self.queue
+
+    global queue
+    queue.sort()
+    queue = App().start()
+
+if __name__ == '__main__':
+    usage  = "usage: %%prog [options] <runscript>"
+    parser = optparse.OptionParser(usage=usage)
+    parser.add_option("-g", "--gui", action="store_true", dest="gui", default=False, help="start gui to selectively start benchmarks") 
+
+    opts, args = parser.parse_args(sys.argv[1:])
+    if len(args) > 0: parser.error("no arguments expected")
+    
+    os.chdir(os.path.dirname(sys.argv[0]))
+    if opts.gui: gui()
+
+    m = Main()
+    m.run(queue)
+"""
+
 class Machine(Sortable):
     """
     Describes a machine.
@@ -86,6 +237,14 @@ class System(Sortable):
         """
         setting.system = self
         self.settings[setting.name] = setting
+
+    def addSettings(self, settings):
+        """
+        Adds all given settings to the system.
+        """
+        for setting in settings:
+            setting.system = self
+            self.settings[setting.name] = setting
         
     def toXml(self, out, indent, settings = None):
         """
@@ -120,6 +279,8 @@ class Setting(Sortable):
     Describes a setting for a system. This are command line options
     that can be passed to the system. Additionally, settings can be tagged. 
     """
+    __slots__ = ("name", "cmdline", "tag", "order", "procs", "ppn", "pbstemplate", "attr", "system")
+
     def __init__(self, name, cmdline, tag, order, procs, ppn, pbstemplate, attr):
         """
         Initializes a system.
@@ -153,17 +314,12 @@ class Setting(Sortable):
         out     - Output stream to write to
         indent  - Amount of indentation
         """
-        tag = " ".join(sorted(self.tag))
-        out.write('{1}<setting name="{0.name}" cmdline="{0.cmdline}" tag="{2}"'.format(self, indent, tag))
-        if self.procs != None:
-            out.write(' {0}="{1}"'.format("procs", self.procs))
-        if self.ppn != None:
-            out.write(' {0}="{1}"'.format("ppn", self.ppn))
-        if self.pbstemplate != None:
-            out.write(' {0}="{1}"'.format("pbstemplate", self.pbstemplate))
-        for key, val in self.attr.items():
-            out.write(' {0}="{1}"'.format(key, val))
-        out.write('/>\n')
+        tag   = " ".join(sorted(self.tag))
+        procs = ' procs="{0}"'.format(self.procs) if self.procs != None else ""
+        ppn   = ' ppn="{0}"'.format(self.ppn) if self.ppn != None else ""
+        pbs   = ' pbstemplate="{0}"'.format(self.pbstemplate) if self.pbstemplate != None else ""
+        attr  = "".join(' {0}="{1}"'.format(key, val) for key, val in self.attr.items())
+        out.write('{1}<setting name="{0.name}" cmdline="{0.cmdline}" tag="{2}"{3}{4}{5}{6}/>\n'.format(self, indent, tag, procs, ppn, pbs, attr))
 
     def __hash__(self):
         """
@@ -207,10 +363,11 @@ class Job(Sortable):
         xmltag  - Tag name for the job
         extra   - Additional arguments for the job 
         """
-        out.write('{1}<{2} name="{0.name}" timeout="{0.timeout}" runs="{0.runs}"{3}'.format(self, indent, xmltag, extra))
+        parts = ['{1}<{2} name="{0.name}" timeout="{0.timeout}" runs="{0.runs}"{3}'.format(self, indent, xmltag, extra)]
         for key, val in self.attr.items():
-            out.write(' {0}="{1}"'.format(key, val))
-        out.write('/>\n')
+            parts.append(' {0}="{1}"'.format(key, val))
+        parts.append('/>\n')
+        out.write("".join(parts))
         
     def __hash__(self):
         """
@@ -232,16 +389,19 @@ class Run(Sortable):
     path - Path that holds the target location for start scripts
     root - directory relative to the location of the run's path.
     """
-    def __init__(self, path):
+    __slots__ = ("path", "root")
+
+    def __init__(self, path, root = None):
         """
         Initializes a run.
         
         Keyword arguments:
         path - A path that holds the location 
                where the individual start scripts for the job shall be generated 
+        root - The current directory relative to path (computed if omitted)
         """
         self.path = path
-        self.root = os.path.relpath(".", self.path) 
+        self.root = root if root != None else os.path.relpath(".", self.path)
     
 class SeqRun(Run):
     """
@@ -257,7 +417,9 @@ class SeqRun(Run):
     solver   - The solver for this run
     timeout  - The timeout of this run
     """
-    def __init__(self, path, run, job, runspec, instance):
+    __slots__ = ("run", "job", "runspec", "instance", "file", "args", "solver", "timeout")
+
+    def __init__(self, path, run, job, runspec, instance, file = None, root = None):
         """
         Initializes a sequential run.
         
@@ -268,13 +430,15 @@ class SeqRun(Run):
         job      - A reference to the job description
         runspec  - A reference to the run description
         instance - A reference to the instance to benchmark
+        file     - The relative path to the instance (computed if omitted)
+        root     - The current directory relative to path (computed if omitted)
         """
-        Run.__init__(self, path)
+        Run.__init__(self, path, root)
         self.run      = run
         self.job      = job
         self.runspec  = runspec
         self.instance = instance
-        self.file     = os.path.relpath(self.instance.path(), self.path)
+        self.file     = file if file != None else os.path.relpath(self.instance.path(), self.path)
         self.args     = self.runspec.setting.cmdline
         self.solver   = self.runspec.system.name + "-" + self.runspec.system.version
         self.timeout  = self.job.timeout
@@ -284,6 +448,8 @@ class ScriptGen:
     A class providing basic functionality to generate 
     start scripts for arbitrary jobs and evaluation of results.
     """
+    __slots__ = ("skip", "job", "startfiles", "templates")
+
     def __init__(self, job):
         """
         Initializes the script generator.
@@ -294,20 +460,34 @@ class ScriptGen:
         self.skip       = False
         self.job        = job
         self.startfiles = []
+        self.templates  = {}
     
     def setSkip(self, skip):
         self.skip = skip
     
-    def _path(self, runspec, instance, run):
+    def _template(self, fileName):
+        """
+        Returns the contents of the given template file.
+        Each file is read only once per script generator.
+        
+        Keyword arguments:
+        fileName - The name of the template file
+        """
+        template = self.templates.get(fileName)
+        if template == None:
+            template = open(fileName).read()
+            self.templates[fileName] = template
+        return template
+    
+    def _instancePath(self, runspec, instance):
         """
-        Returns the relative path to the start script location.
+        Returns the relative path to the directory holding the runs of an instance.
         
         Keyword arguments:
         runspec  - The run specification for the start script
         instance - The benchmark instance for the start script
-        run      - The number of the run for the start script
         """
-        return os.path.join(runspec.path(), instance.classname.name, instance.instance, "run%d" % run)    
+        return os.path.join(runspec.path(), instance.classname.name, instance.instance)
     
     def addToScript(self, runspec, instance):
         """
@@ -317,21 +497,49 @@ class ScriptGen:
         runspec  - The run specification for the start script
         instance - The benchmark instance for the start script
         """
-        skip = self.skip
+        skip     = self.skip
+        # the template is only read once a run actually needs a start script
+        template = None
+        instpath = self._instancePath(runspec, instance)
+        # all run directories are siblings, so they share their relative paths
+        runpath  = os.path.join(instpath, "run1")
+        relfile  = os.path.relpath(instance.path(), runpath)
+        root     = os.path.relpath(".", runpath)
+        # list the instance directory once instead of probing every run directory
+        try: existing = set(os.listdir(instpath))
+        except OSError: existing = set()
         for run in range(1, self.job.runs + 1):
-            path = self._path(runspec, instance, run)
-            tools.mkdir_p(path)
-            startpath = os.path.join(path, "start.sh")
-            finish    = os.path.join(path, ".finished")
-            if skip and os.path.isfile(finish):
+            rundir = "run%d" % run
+            path   = os.path.join(instpath, rundir)
+            if not rundir in existing:
+                tools.mkdir_p(path)
+            elif skip and os.path.isfile(os.path.join(path, ".finished")):
                 continue
-            template  = open(runspec.system.config.template).read()
+            if template == None: template = self._template(runspec.system.config.template)
+            startpath = os.path.join(path, "start.sh")
             startfile = open(startpath, "w")
-            startfile.write(template.format(run=SeqRun(path, run, self.job, runspec, instance)))
+            startfile.write(template.format(run=SeqRun(path, run, self.job, runspec, instance, relfile, root)))
             startfile.close()
             self.startfiles.append((runspec, path, "start.sh"))
             tools.setExecutable(startpath)
 
+    def _relStartfiles(self, path):
+        """
+        Yields the run specification and the path relative to 
+        the given path of each start script generated using addToScript().
+        
+        Keyword arguments:
+        path - The location the paths shall be relative to
+        """
+        reldirs = {}
+        for (runspec, instpath, instname) in self.startfiles:
+            instdir, rundir = os.path.split(instpath)
+            reldir = reldirs.get(instdir)
+            if reldir == None:
+                reldir = os.path.relpath(instdir, path)
+                reldirs[instdir] = reldir
+            yield runspec, os.path.join(reldir, rundir, instname)
+
     def evalResults(self, out, indent, runspec, instance):
         """
         Parses the results of a given benchmark instance and outputs them as XML.
@@ -342,17 +550,22 @@ class ScriptGen:
         runspec - The run specification of the benchmark
         runspec - The benchmark instance
         """
+        parse    = getattr(benchmarktool.config, runspec.system.measures)
+        instpath = self._instancePath(runspec, instance)
         for run in range(1, self.job.runs + 1):
-            out.write('{0}<run number="{1}">\n'.format(indent, run))
-            result = getattr(benchmarktool.config, runspec.system.measures)(self._path(runspec, instance, run), runspec, instance)
+            parts = ['{0}<run number="{1}">\n'.format(indent, run)]
+            result = parse(os.path.join(instpath, "run%d" % run), runspec, instance)
             for key, valtype, val in sorted(result):
-                out.write('{0}<measure name="{1}" type="{2}" val="{3}"/>\n'.format(indent + "\t", key, valtype, val))
-            out.write('{0}</run>\n'.format(indent))
+                parts.append('{0}<measure name="{1}" type="{2}" val="{3}"/>\n'.format(indent + "\t", key, valtype, val))
+            parts.append('{0}</run>\n'.format(indent))
+            out.write("".join(parts))
             
 class SeqScriptGen(ScriptGen):
     """
     A class that generates and evaluates start scripts for sequential runs.
     """
+    __slots__ = ()
+
     def __init__(self, seqJob):
         """
         Initializes the script generator.
@@ -372,162 +585,8 @@ class SeqScriptGen(ScriptGen):
         """
         tools.mkdir_p(path)
         startfile = open(os.path.join(path, "start.py"), 'w')
-        queue = ""
-        comma = False
-        for (_, instpath, instname) in self.startfiles:
-            relpath = os.path.relpath(instpath, path)
-            if comma: queue += ","
-            else: comma  = True
-            queue+= repr(os.path.join(relpath, instname))
-        startfile.write("""\
-#!/usr/bin/python -u
-
-import optparse
-import threading
-import subprocess
-import os
-import sys
-import signal
-import time
-
-queue = [{0}]
-
-class Main:
-    def __init__(self):
-        self.running  = set()
-        self.cores    = set()
-        self.started  = 0
-        self.total    = None
-        self.finished = threading.Condition()
-        self.coreLock = threading.Lock()
-        c = 0
-        while len(self.cores) < {1}:
-            self.cores.add(c)
-            c += 1
-    
-    def finish(self, thread):
-        self.finished.acquire()
-        self.running.remove(thread)
-        with self.coreLock:
-            self.cores.add(thread.core)
-        self.finished.notify()
-        self.finished.release()
-   
-    def start(self, cmd):
-        core     = 0
-        with self.coreLock:
-            core = self.cores.pop()
-        thread = Run(cmd, self, core)
-        self.started += 1
-        self.running.add(thread)
-        print("({{0}}/{{1}}/{{2}}/{{4}}) {{3}}".format(len(self.running), self.started, self.total, cmd, core))
-        thread.start()
-    
-    def run(self, queue):
-        signal.signal(signal.SIGTERM, self.exit)
-        signal.signal(signal.SIGINT, self.exit)
-        signal.signal(signal.SIGHUP, signal.SIG_IGN)
-        self.finished.acquire()
-        self.total = len(queue)
-        for cmd in queue:
-            while len(self.running) >= {1}:
-                self.finished.wait()
-            self.start(cmd)
-        while len(self.running) != 0:
-            self.finished.wait()
-        self.finished.release()
-
-    def exit(self, *args):
-        signal.signal(signal.SIGINT, signal.SIG_IGN)
-        signal.signal(signal.SIGTERM, signal.SIG_IGN)
-        print("WARNING: it is not guaranteed that all processes will be terminated!")
-        print("sending sigterm ...")
-        os.killpg(os.getpgid(0), signal.SIGTERM)
-        print("waiting 10s...")
-        time.sleep(10)
-        print("sending sigkill ...")
-        os.killpg(os.getpgid(0), signal.SIGKILL)
-
-class Run(threading.Thread):
-    def __init__(self, cmd, main, core):
-        threading.Thread.__init__(self)
-        self.cmd  = cmd
-        self.main = main
-        self.core = core
-        self.proc = None
-    
-    def run(self):
-        path, script = os.path.split(self.cmd)
-        openArgs = dict(cwd=path)
-        if sys.version_info[:3] >= (3,2,0):
-            openArgs["start_new_session"] = True
-        else:
-            openArgs["preexec_fn"] = os.setsid
-        self.proc = subprocess.Popen(["bash", script, str(self.core)], **openArgs)
-        self.proc.wait()
-        self.main.finish(self)
-
-def gui():
-    import Tkinter
-    class App:
-        def __init__(self):
-            root    = Tkinter.Tk()
-            frame   = Tkinter.Frame(root)
-            scrollx = Tkinter.Scrollbar(frame, orient=Tkinter.HORIZONTAL)
-            scrolly = Tkinter.Scrollbar(frame)
-            list    = Tkinter.Listbox(frame, selectmode=Tkinter.MULTIPLE)
-            
-            for script in queue:
-                list.insert(Tkinter.END, script)
-            
-            scrolly.config(command=list.yview)
-            scrollx.config(command=list.xview)
-            list.config(yscrollcommand=scrolly.set)
-            list.config(xscrollcommand=scrollx.set)
-                
-            scrolly.pack(side=Tkinter.RIGHT, fill=Tkinter.Y)
-            scrollx.pack(side=Tkinter.BOTTOM, fill=Tkinter.X)
-            list.pack(fill=Tkinter.BOTH, expand=1)
-            
-            button = Tkinter.Button(root, text='Run', command=self.pressed)
-            
-            frame.pack(fill=Tkinter.BOTH, expand=1)
-            button.pack(side=Tkinter.BOTTOM, fill=Tkinter.X)
-
-            self.root  = root
-            self.list  = list
-            self.run   = False
-            self.queue = [] 
-        
-        def pressed(self):
-            sel = self.list.curselection()
-            for index in sel:
-                global queue
-                self.queue.append(queue[int(index)])
-            self.root.destroy()
-
-        def start(self):
-            self.root.mainloop()
-            return self.queue
-
-    global queue
-    queue.sort()
-    queue = App().start()
-
-if __name__ == '__main__':
-    usage  = "usage: %prog [options] <runscript>"
-    parser = optparse.OptionParser(usage=usage)
-    parser.add_option("-g", "--gui", action="store_true", dest="gui", default=False, help="start gui to selectively start benchmarks") 
-
-    opts, args = parser.parse_args(sys.argv[1:])
-    if len(args) > 0: parser.error("no arguments expected")
-    
-    os.chdir(os.path.dirname(sys.argv[0]))
-    if opts.gui: gui()
-
-    m = Main()
-    m.run(queue)
-""".format(queue, self.job.parallel))
+        queue = ",".join(repr(jobScript) for (_, jobScript) in self._relStartfiles(path))
+        startfile.write(seqStartTemplate % {"queue": queue, "parallel": self.job.parallel})
         startfile.close()
         tools.setExecutable(os.path.join(path, "start.py"))
 
@@ -535,9 +594,13 @@ class PbsScriptGen(ScriptGen):
     """
     A class that generates and evaluates start scripts for pbs runs.
     """
+    __slots__ = ()
+
     class PbsScript:
-        def __init__(self, runspec, path, queue):
-            self.runspec      = runspec
+        def __init__(self, setting, job, template, path, queue):
+            self.setting      = setting
+            self.job          = job
+            self.template     = template
             self.path         = path
             self.queue        = queue
             self.num          = 0
@@ -548,20 +611,19 @@ class PbsScriptGen(ScriptGen):
         def write(self):
             if self.num > 0:
                 self.num = 0
-                template = open(self.runspec[2], "r").read()
-                script   = os.path.join(self.path, "start{0:04}.pbs".format(len(self.queue)))
-                open(script, "w").write(template.format(walltime=tools.pbsTime(self.runspec[3]), nodes=self.runspec[1], ppn=self.runspec[0], jobs=self.startscripts, cpt=self.runspec[4], partition=self.runspec[5]))
+                script = os.path.join(self.path, "start{0:04}.pbs".format(len(self.queue)))
+                open(script, "w").write(self.template.format(walltime=tools.pbsTime(self.job.walltime), nodes=self.setting.procs, ppn=self.setting.ppn, jobs="\n".join(self.startscripts) + "\n", cpt=self.job.cpt, partition=self.job.partition))
                 self.queue.append(script)
                     
         def next(self):
             self.write()
-            self.startscripts = ""
+            self.startscripts = []
             self.num          = 0
             self.time         = 0
             
         def append(self, startfile):
             self.num          += 1
-            self.startscripts += startfile + "\n"
+            self.startscripts.append(startfile)
             
     def __init__(self, seqJob):
         """
@@ -584,28 +646,29 @@ class PbsScriptGen(ScriptGen):
         startfile = open(os.path.join(path, "start.sh"), 'w')
         queue      = []
         pbsScripts = {}
-        for (runspec, instpath, instname) in self.startfiles:
-            relpath   = os.path.relpath(instpath, path)
-            jobScript = os.path.join(relpath, instname)
-            pbsKey    = (runspec.setting.ppn, runspec.setting.procs, runspec.setting.pbstemplate, runspec.project.job.walltime, runspec.project.job.cpt, runspec.project.job.partition)
+        # all start scripts belong to this generator's job,
+        # so only the setting's resources distinguish pbs scripts
+        for (runspec, jobScript) in self._relStartfiles(path):
+            setting   = runspec.setting
+            pbsKey    = (setting.ppn, setting.procs, setting.pbstemplate)
             
-            if not pbsKey in pbsScripts:
-                pbsScript = PbsScriptGen.PbsScript(pbsKey, path, queue)
+            pbsScript = pbsScripts.get(pbsKey)
+            if pbsScript == None:
+                pbsScript = PbsScriptGen.PbsScript(setting, self.job, self._template(setting.pbstemplate), path, queue)
                 pbsScripts[pbsKey] = pbsScript
-            else: pbsScript = pbsScripts[pbsKey]
             
             if self.job.script_mode == "multi":
                 if pbsScript.num > 0: pbsScript.next()
                 pbsScript.append(jobScript)
             elif self.job.script_mode == "timeout":
-                if pbsScript.time + runspec.project.job.timeout + 300 >= runspec.project.job.walltime:
+                if pbsScript.time + self.job.timeout + 300 >= self.job.walltime:
                     pbsScript.next()
-                pbsScript.time += runspec.project.job.timeout + 300
+                pbsScript.time += self.job.timeout + 300
                 pbsScript.append(jobScript)
 
         for pbsScript in pbsScripts.values(): pbsScript.write()
 
-        startfile.write("""#!/bin/bash\n\ncd "$(dirname $0)"\n""" + "\n".join(['sbatch "{0}"'.format(os.path.basename(x)) for x in queue]))
+        startfile.write('#!/bin/bash\n\ncd "$(dirname $0)"\n' + "\n".join('sbatch "{0}"'.format(os.path.basename(x)) for x in queue))
         startfile.close()
         tools.setExecutable(os.path.join(path, "start.sh"))
 
@@ -730,10 +793,14 @@ class Benchmark(Sortable):
     Describes a benchmark. This includes a set of classes
     that describe where to find particular instances.
     """
+    __slots__ = ("name", "elements", "instances", "classes", "ordered", "initialized")
+
     class Class(Sortable):
         """
         Describes a benchmark class.
         """
+        __slots__ = ("name", "id")
+
         def __init__(self, name):
             """
             Initializes a benchmark class.
@@ -760,6 +827,8 @@ class Benchmark(Sortable):
         """
         Describes a benchmark instance.
         """
+        __slots__ = ("location", "classname", "instance", "id")
+
         def __init__(self, location, classname, instance):
             """
             Initializes a benchmark instance. The instance name uniquely identifies
@@ -808,6 +877,8 @@ class Benchmark(Sortable):
         """
         Describes a folder that should recursively be scanned for benchmarks.
         """
+        __slots__ = ("path", "prefixes")
+
         def __init__(self, path):
             """
             Initializes a benchmark folder.
@@ -838,6 +909,8 @@ class Benchmark(Sortable):
             """
             if path == ".svn": 
                 return True
+            if len(self.prefixes) == 0:
+                return False
             path = os.path.normpath(os.path.join(root, path))
             return path in self.prefixes
             
@@ -848,8 +921,11 @@ class Benchmark(Sortable):
             Keyword arguments:
             benchmark - The benchmark to be populated.
             """
+            # os.walk joins the names of subfolders to the scanned path,
+            # so the relative path can be cut off without os.path.relpath
+            prefix = len(os.path.join(self.path, ""))
             for root, dirs, files in os.walk(self.path):
-                relroot = os.path.relpath(root, self.path)
+                relroot = root[prefix:] or "."
                 sub = []
                 for dirname in dirs:
                     if self._skip(relroot, dirname): continue
@@ -863,6 +939,8 @@ class Benchmark(Sortable):
         """
         Describes a set of individual files in a benchmark.
         """
+        __slots__ = ("path", "files")
+
         def __init__(self, path):
             """
             Initializes to the empty set of files.
@@ -904,6 +982,8 @@ class Benchmark(Sortable):
         self.name        = name
         self.elements    = []
         self.instances   = {}
+        self.classes     = {}
+        self.ordered     = []
         self.initialized = False
         
     def addElement(self, element):
@@ -925,9 +1005,12 @@ class Benchmark(Sortable):
         relroot  - The folder relative to the root folder
         filename - The filename of the instance
         """
-        classname = Benchmark.Class(relroot)
-        if not classname in self.instances: 
+        # all instances of a class share one class object
+        if not relroot in self.classes:
+            classname = Benchmark.Class(relroot)
+            self.classes[relroot]     = classname
             self.instances[classname] = set()
+        else: classname = self.classes[relroot]
         self.instances[classname].add(Benchmark.Instance(root, classname, filename))
     
     def init(self):
@@ -942,9 +1025,11 @@ class Benchmark(Sortable):
                 classname.id = classid
                 classid += 1
                 instanceid = 0
-                for instance in sorted(self.instances[classname]):
+                instances  = sorted(self.instances[classname])
+                for instance in instances:
                     instance.id = instanceid
                     instanceid += 1
+                self.ordered.append((classname, instances))
             self.initialized = True
             
 
@@ -958,10 +1043,9 @@ class Benchmark(Sortable):
         """
         self.init()
         out.write('{1}<benchmark name="{0}">\n'.format(self.name, indent))
-        for classname in sorted(self.instances.keys()):
-            instances = self.instances[classname]
+        for classname, instances in self.ordered:
             out.write('{1}<class name="{0.name}" id="{0.id}">\n'.format(classname, indent + "\t"))
-            for instance in sorted(instances):
+            for instance in instances:
                 instance.toXml(out, indent + "\t\t")
             out.write('{0}</class>\n'.format(indent + "\t"))
         out.write('{0}</benchmark>\n'.format(indent))
@@ -997,14 +1081,18 @@ class Runspec(Sortable):
         self.system    = setting.system
         self.benchmark = benchmark
         self.project   = None
+        self._outPath  = None
     
     def path(self):
         """
         Returns an output path under which start scripts 
         and benchmark results are stored.  
         """
-        name = self.setting.system.name + "-" + self.setting.system.version + "-" + self.setting.name
-        return os.path.join(self.project.path(), self.machine.name, "results", self.benchmark.name, name)
+        # the path is requested for every run of every instance
+        if self._outPath == None:
+            name = self.setting.system.name + "-" + self.setting.system.version + "-" + self.setting.name
+            self._outPath = os.path.join(self.project.path(), self.machine.name, "results", self.benchmark.name, name)
+        return self._outPath
     
     def genScripts(self, scriptGen):
         """
@@ -1042,6 +1130,7 @@ class Project(Sortable):
         self.runspecs  = {}
         self.runscript = None
         self.job       = None
+        self.tagged    = {}
 
     def addRuntag(self, machine, benchmark, tag):
         """
@@ -1053,11 +1142,18 @@ class Project(Sortable):
         benchmark - The benchmark set to evaluate
         tag       - The tags of systems+settings to run 
         """
-        disj = TagDisj(tag)
-        for system in self.runscript.systems.values():
-            for setting in system.settings.values():
-                if disj.match(setting.tag):
-                    self.addRunspec(machine, system.name, system.version, setting.name, benchmark)
+        # the same tags are typically used for several machines and benchmarks
+        settings = self.tagged.get(tag)
+        if settings == None:
+            disj     = TagDisj(tag)
+            settings = []
+            for system in self.runscript.systems.values():
+                for setting in system.settings.values():
+                    if disj.match(setting.tag):
+                        settings.append(setting)
+            self.tagged[tag] = settings
+        for setting in settings:
+            self._addRunspec(machine, setting, benchmark)
         
     def addRunspec(self, machine, system, version, setting, benchmark):
         """
@@ -1071,12 +1167,20 @@ class Project(Sortable):
         setting   - The settings to run the system with
         benchmark - The benchmark set to evaluate
         """
-        runspec = Runspec(self.runscript.machines[machine],
-                          self.runscript.systems[(system,version)].settings[setting], 
-                          self.runscript.benchmarks[benchmark])
+        self._addRunspec(machine, self.runscript.systems[(system,version)].settings[setting], benchmark)
+
+    def _addRunspec(self, machine, setting, benchmark):
+        """
+        Adds a run specification for an already resolved setting.
+
+        Keyword arguments:
+        machine   - The name of the machine to run on
+        setting   - The setting to run with (includes system)
+        benchmark - The name of the benchmark set to evaluate
+        """
+        runspec = Runspec(self.runscript.machines[machine], setting, self.runscript.benchmarks[benchmark])
         runspec.project = self
-        if not machine in self.runspecs: self.runspecs[machine] = []
-        self.runspecs[machine].append(runspec)
+        self.runspecs.setdefault(machine, []).append(runspec)
     
     def path(self):
         """
@@ -1235,7 +1339,7 @@ class Runscript:
             for runspecs in project.runspecs.values():
                 for runspec in runspecs:
                     out.write('\t\t<runspec machine="{0.machine.name}" system="{0.system.name}" version="{0.system.version}" benchmark="{0.benchmark.name}" setting="{0.setting.name}">\n'.format(runspec))
-                    for classname in sorted(runspec.benchmark.instances):
+                    for classname, _ in runspec.benchmark.ordered:
                         out.write('\t\t\t<class id="{0.id}">\n'.format(classname))
                         instances =  runspec.benchmark.instances[classname]
                         for instance in instances:
@@ -1249,6 +1353,7 @@ class Runscript:
          
 class TagDisj:
     """Represents tags in form of a disjunctive normal form."""
+    __slots__ = ("tag",)
     ALL = 1
     def __init__(self, tag):
         """
@@ -1266,8 +1371,7 @@ class TagDisj:
             self.tag = []
             tagDisj = tag.split("|")
             for tagConj in tagDisj:
-                tagList = tagConj.split(None)
-                self.tag.append(frozenset(tagList))
+                self.tag.append(tools.splitSet(tagConj))
                 
     def match(self, tag):
         """
@@ -28,6 +28,14 @@ def xmlTime(strRep):
     if len(timeout) > 2: hours   = int(timeout[-3])
     return seconds + minutes * 60 + hours * 60 * 60
 
+def splitSet(strRep):
+    """
+    Converts a whitespace separated list into a frozenset.
+    (Returns the empty set if strRep is None.)
+    """
+    if strRep == None: return frozenset()
+    return frozenset(strRep.split(None))
+
 def pbsTime(intRep):
     s = intRep % 60
     intRep //= 60
@@ -106,6 +114,9 @@ def cmp(a, b):
     else: return 0
 
 class Sortable:
+    # allows subclasses to do without a per-instance __dict__
+    __slots__ = ()
+
     def __le__(self, other):
         return self.__cmp__(other) <= 0
 